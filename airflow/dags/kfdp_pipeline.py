@@ -4,18 +4,75 @@ from __future__ import annotations
 Airflow DAG definition for the Korea Fertility Data Platform pipeline.
 
 This DAG orchestrates the ingestion of an Excel file into a long‑format
-parquet file, loading it into DuckDB, running dbt models and tests, and
-logging the run metadata.  It is scheduled to run once per day at 03:00 UTC.
+parquet file, loading it into DuckDB, building the dbt models and tests layer
+by layer (silver, then gold), and logging the run metadata.  It is scheduled to
+run once per day at 03:00 UTC.
 """
 
+import logging
+import os
+import urllib.request
 from datetime import timedelta
+from pathlib import Path
 
 import pendulum
 from airflow import DAG
 from airflow.operators.bash import BashOperator
+from airflow.operators.python import PythonOperator
+
+logger = logging.getLogger(__name__)
 
 # Base directory inside the Airflow container
 BASE_DIR = "/opt/airflow"
+DB_PATH = Path(BASE_DIR) / "warehouse" / "kfdp.duckdb"
+SILVER_PARQUET = Path(BASE_DIR) / "data" / "silver" / "tfr_long.parquet"
+
+
+# The Python steps run inside the task process instead of spawning a fresh
+# interpreter per task.  Imports are deferred to task run time so that DAG
+# parsing does not pay for pandas/DuckDB.
+def _ingest_excel() -> None:
+    from kfdp.cli.ingest_tfr import ingest_tfr
+
+    ingest_tfr(Path(BASE_DIR) / "data" / "bronze" / "tfr_source.xlsx", SILVER_PARQUET)
+
+
+def _load_to_duckdb() -> None:
+    from load_silver_to_duckdb import load_silver
+
+    load_silver(DB_PATH, SILVER_PARQUET)
+
+
+def _log_success() -> None:
+    from log_pipeline_run import log_pipeline_run
+
+    log_pipeline_run(DB_PATH, "success", "tfr_source.xlsx")
+    _invalidate_api_cache()
+
+
+def _invalidate_api_cache() -> None:
+    """
+    Ask the API to drop its cached responses now that new data is published.
+
+    Skipped unless ``KFDP_API_URL`` and ``KFDP_ADMIN_TOKEN`` are set.  A failed
+    call is only logged: the run itself succeeded and the cache expires anyway.
+    """
+    api_url = os.getenv("KFDP_API_URL")
+    token = os.getenv("KFDP_ADMIN_TOKEN")
+    if not api_url or not token:
+        logger.info("API URL or admin token not set; skipping cache invalidation")
+        return
+    request = urllib.request.Request(
+        f"{api_url.rstrip('/')}/admin/invalidate",
+        method="POST",
+        headers={"X-Admin-Token": token},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+    except OSError as e:
+        logger.warning("Could not invalidate the API cache at %s: %s", api_url, e)
+
 
 default_args = {
     "owner": "kfdp",
@@ -33,53 +90,43 @@ with DAG(
     tags=["kfdp", "duckdb", "dbt"],
 ) as dag:
 
-    ingest_excel = BashOperator(
+    ingest_excel = PythonOperator(
         task_id="ingest_excel_to_silver_parquet",
-        bash_command=(
-            f"python {BASE_DIR}/src/kfdp/cli/ingest_tfr.py "
-            f"--input {BASE_DIR}/data/bronze/tfr_source.xlsx "
-            f"--output {BASE_DIR}/data/silver/tfr_long.parquet"
-        ),
-        env={"PYTHONPATH": f"{BASE_DIR}/src"},
+        python_callable=_ingest_excel,
     )
 
-    load_to_duckdb = BashOperator(
+    load_to_duckdb = PythonOperator(
         task_id="load_silver_to_duckdb",
-        bash_command=(
-            f"python {BASE_DIR}/scripts/load_silver_to_duckdb.py "
-            f"--db {BASE_DIR}/warehouse/kfdp.duckdb "
-            f"--parquet {BASE_DIR}/data/silver/tfr_long.parquet"
-        ),
-        env={"PYTHONPATH": f"{BASE_DIR}/src"},
+        python_callable=_load_to_duckdb,
     )
 
-    dbt_run = BashOperator(
-        task_id="dbt_run",
+    # dbt is built per layer (selected by the tags set in dbt_project.yml);
+    # ``dbt build`` runs each layer's models and tests in one invocation, so
+    # a failure is isolated to its layer.  The layers run one after another
+    # because DuckDB allows only one writing process per database file.
+    dbt_silver = BashOperator(
+        task_id="dbt_build_silver",
         bash_command=(
             f"cd {BASE_DIR} && "
-            f"/home/airflow/.local/bin/dbt run --project-dir {BASE_DIR}/dbt/kfdp"
+            f"/home/airflow/.local/bin/dbt build --project-dir {BASE_DIR}/dbt/kfdp "
+            "--select tag:silver"
         ),
         env={"DBT_PROFILES_DIR": f"{BASE_DIR}/dbt"},
     )
 
-    dbt_test = BashOperator(
-        task_id="dbt_test",
+    dbt_gold = BashOperator(
+        task_id="dbt_build_gold",
         bash_command=(
             f"cd {BASE_DIR} && "
-            f"/home/airflow/.local/bin/dbt test --project-dir {BASE_DIR}/dbt/kfdp"
+            f"/home/airflow/.local/bin/dbt build --project-dir {BASE_DIR}/dbt/kfdp "
+            "--select tag:gold"
         ),
         env={"DBT_PROFILES_DIR": f"{BASE_DIR}/dbt"},
     )
 
-    log_success = BashOperator(
+    log_success = PythonOperator(
         task_id="log_run_success",
-        bash_command=(
-            f"python {BASE_DIR}/scripts/log_pipeline_run.py "
-            f"--db {BASE_DIR}/warehouse/kfdp.duckdb "
-            f"--status success "
-            f"--source-file tfr_source.xlsx"
-        ),
-        env={"PYTHONPATH": f"{BASE_DIR}/src"},
+        python_callable=_log_success,
     )
 
-    ingest_excel >> load_to_duckdb >> dbt_run >> dbt_test >> log_success
+    ingest_excel >> load_to_duckdb >> dbt_silver >> dbt_gold >> log_success
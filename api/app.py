@@ -3,21 +3,45 @@ from __future__ import annotations
 """
 FastAPI application exposing Total Fertility Rate metrics and pipeline run history.
 
-The API connects to a local DuckDB database in read‑only mode.  It automatically
-detects whether the curated mart lives in a ``gold`` or ``main_gold`` schema and
-exposes endpoints for health checks, latest metrics, date‑range queries and
-pipeline run metadata.
+The API opens a short‑lived read‑only connection to the local DuckDB database
+for each request, so the pipeline can take the write lock between requests.
+It automatically detects whether the curated mart lives in a ``gold`` or
+``main_gold`` schema (once per database file version) and exposes endpoints for
+health checks, latest metrics, date‑range queries and pipeline run metadata.
 """
 
 import os
-from typing import Any, Optional, List, Dict
+import secrets
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
 
 import duckdb
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.decorator import cache
+
+from kfdp.io.duckdb_config import duckdb_config
 
 # Default path to the warehouse database
 DB_PATH_DEFAULT = "warehouse/kfdp.duckdb"
 
+# Responses only change when the daily pipeline runs, so cache them for an hour
+CACHE_EXPIRE_SECONDS = 3600
+
+# Number of rows per Arrow record batch when streaming query results
+STREAM_BATCH_ROWS = 1024
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib ``json`` encoder."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
 
 def _connect_readonly(db_path: str) -> duckdb.DuckDBPyConnection:
     """Return a read‑only connection to the given DuckDB file."""
@@ -26,7 +50,7 @@ def _connect_readonly(db_path: str) -> duckdb.DuckDBPyConnection:
             f"DuckDB file not found: {db_path}. "
             "Run the pipeline first (ingest -> load -> dbt)."
         )
-    return duckdb.connect(db_path, read_only=True)
+    return duckdb.connect(db_path, read_only=True, config=duckdb_config())
 
 
 def _detect_gold_schema(con: duckdb.DuckDBPyConnection) -> str:
@@ -60,47 +84,187 @@ def _detect_gold_schema(con: duckdb.DuckDBPyConnection) -> str:
     )
 
 
-def _df_records(
+def _records(
     con: duckdb.DuckDBPyConnection, sql: str, params: Optional[List[Any]] = None
 ) -> List[Dict[str, Any]]:
-    """Execute a query and return the result as a list of dictionaries."""
-    df = con.execute(sql, params or []).df()
-    return df.to_dict(orient="records")
+    """
+    Execute a query and return the result as a list of dictionaries.
+
+    Rows are fetched as plain tuples and zipped with the column names, which
+    avoids materialising an intermediate pandas DataFrame.  Dates and
+    timestamps are returned as ISO strings, so a response rendered from the
+    cache is identical to one rendered from the query.
+    """
+    cur = con.execute(sql, params or [])
+    cols = [d[0] for d in cur.description]
+    return [
+        {c: v.isoformat() if isinstance(v, date) else v for c, v in zip(cols, row)}
+        for row in cur.fetchall()
+    ]
+
+
+def _stream_json_array(
+    reader: Any, con: duckdb.DuckDBPyConnection
+) -> Iterator[bytes]:
+    """
+    Yield a JSON array built from an Arrow record batch reader, batch by batch.
+
+    Each batch is serialised with ``orjson`` and spliced into a single array,
+    so the full result is never held in memory as Python objects.  The
+    connection is closed once the stream is exhausted or the client disconnects.
+    """
+    try:
+        yield b"["
+        first = True
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            if not first:
+                yield b","
+            yield orjson.dumps(batch.to_pylist())[1:-1]
+            first = False
+        yield b"]"
+    finally:
+        con.close()
+
+
+app = FastAPI(title="KFDP API", version="1.0.0", default_response_class=_ORJSONResponse)
+
+
+@app.middleware("http")
+async def _revalidate_cached_responses(request: Request, call_next: Any) -> Response:
+    """
+    Make clients revalidate responses served from the in‑process cache.
+
+    fastapi-cache2 sends ``Cache-Control: max-age=...``, which would let
+    browsers and proxies keep stale data after ``/admin/invalidate``.  With
+    ``no-cache`` they revalidate using the ``ETag`` it also sends, which a
+    cache hit answers with ``304 Not Modified``.
+    """
+    response = await call_next(request)
+    if "x-fastapi-cache" in response.headers:
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.on_event("startup")
+def _startup() -> None:
+    """Resolve the database path, set up the response cache and warm the gold schema."""
+    app.state.db_path = os.getenv("KFDP_DB_PATH", DB_PATH_DEFAULT)
+    FastAPICache.init(InMemoryBackend(), prefix="kfdp")
+    try:
+        _gold_schema()
+    except Exception:
+        # The pipeline may not have produced the warehouse yet; endpoints retry
+        # on first use and surface the error to the caller.
+        pass
+
+
+def _connect() -> duckdb.DuckDBPyConnection:
+    """
+    Open a read‑only connection to the configured database for one request.
+
+    DuckDB allows a single writing process per file and a read‑only handle
+    blocks writers for as long as it is open, so connections are not kept
+    between requests.
+    """
+    return _connect_readonly(app.state.db_path)
+
+
+@lru_cache(maxsize=4)
+def _detect_gold_schema_cached(db_path: str, mtime: float) -> str:
+    """
+    Detect the gold schema once per database file version.
+
+    The modification time is part of the cache key so that the result is
+    recomputed automatically after a pipeline run rewrites the file.
+    """
+    with _connect_readonly(db_path) as con:
+        return _detect_gold_schema(con)
+
 
+def _gold_schema() -> str:
+    """Return the (cached) gold schema of the configured database."""
+    db_path = app.state.db_path
+    return _detect_gold_schema_cached(db_path, os.path.getmtime(db_path))
 
-app = FastAPI(title="KFDP API", version="1.0.0")
+
+# WHERE clause for each combination of (start given, end given) in /tfr
+_TFR_RANGE_WHERE = {
+    (False, False): "",
+    (True, False): "WHERE year >= ?",
+    (False, True): "WHERE year <= ?",
+    (True, True): "WHERE year >= ? AND year <= ?",
+}
+
+
+def _tfr_latest_sql(gold_schema: str) -> str:
+    """Return the SQL text for ``/tfr/latest`` against the given gold schema."""
+    return f"""
+    SELECT country, year, value, yoy_delta, ma_5y, is_below_replacement
+    FROM {gold_schema}.mart_tfr_latest
+    ORDER BY year DESC
+    LIMIT 1;
+    """
+
+
+def _tfr_range_sql(gold_schema: str, has_start: bool, has_end: bool) -> str:
+    """
+    Return the SQL text for ``/tfr`` for one shape of year filter.
+
+    The WHERE clause comes from a fixed table per filter shape; the years and
+    limit are always bound as parameters.
+    """
+    return f"""
+    SELECT country, year, value, yoy_delta, ma_5y, is_below_replacement
+    FROM {gold_schema}.mart_tfr_metrics
+    {_TFR_RANGE_WHERE[(has_start, has_end)]}
+    ORDER BY year ASC
+    LIMIT ?;
+    """
+
+
+@app.get("/livez")
+def livez() -> dict:
+    """Liveness probe: return immediately without touching the database."""
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+def readyz() -> dict:
+    """Readiness probe: succeed once the warehouse and its gold schema are found."""
+    try:
+        with _connect():
+            gold_schema = _gold_schema()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"status": "ready", "gold_schema": gold_schema}
 
 
 @app.get("/health")
 def health() -> dict:
-    """Return a simple health check with database path and detected schema."""
-    db_path = os.getenv("KFDP_DB_PATH", DB_PATH_DEFAULT)
+    """
+    Return a human‑readable health summary with database path and gold schema.
+
+    The schema comes from the cached detection, so this is cheap, but probes
+    should prefer ``/livez`` and ``/readyz``.
+    """
+    db_path = app.state.db_path
     try:
-        con = _connect_readonly(db_path)
-        gold_schema = _detect_gold_schema(con)
-        con.close()
+        with _connect():
+            gold_schema = _gold_schema()
         return {"status": "ok", "db_path": db_path, "gold_schema": gold_schema}
     except Exception as e:
         return {"status": "degraded", "db_path": db_path, "error": str(e)}
 
 
 @app.get("/tfr/latest")
+@cache(expire=CACHE_EXPIRE_SECONDS)
 def tfr_latest() -> dict:
-    """Return the most recent record from the TFR mart."""
-    db_path = os.getenv("KFDP_DB_PATH", DB_PATH_DEFAULT)
+    """Return the most recent record from the precomputed ``mart_tfr_latest`` table."""
     try:
-        con = _connect_readonly(db_path)
-        gold_schema = _detect_gold_schema(con)
-        rows = _df_records(
-            con,
-            f"""
-            SELECT country, year, value, yoy_delta, ma_5y, is_below_replacement
-            FROM {gold_schema}.mart_tfr_metrics
-            ORDER BY year DESC
-            LIMIT 1;
-            """,
-        )
-        con.close()
+        with _connect() as con:
+            rows = _records(con, _tfr_latest_sql(_gold_schema()))
         if not rows:
             raise HTTPException(status_code=404, detail="No rows found.")
         return rows[0]
@@ -117,37 +281,27 @@ def tfr_range(
     start: Optional[int] = Query(default=None, ge=1800, le=2200),
     end: Optional[int] = Query(default=None, ge=1800, le=2200),
     limit: int = Query(default=1000, ge=1, le=5000),
-) -> List[Dict[str, Any]]:
-    """Return rows from the TFR mart between optional start and end years."""
-    db_path = os.getenv("KFDP_DB_PATH", DB_PATH_DEFAULT)
+) -> StreamingResponse:
+    """
+    Return rows from the TFR mart between optional start and end years.
+
+    The result is streamed as a JSON array in Arrow record batches rather than
+    built up as a list first, so it is not stored in the response cache.
+    """
     try:
-        con = _connect_readonly(db_path)
-        gold_schema = _detect_gold_schema(con)
-
-        where_clauses: List[str] = []
-        params: List[Any] = []
-
-        if start is not None:
-            where_clauses.append("year >= ?")
-            params.append(start)
-        if end is not None:
-            where_clauses.append("year <= ?")
-            params.append(end)
-
-        where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
-
-        sql = f"""
-        SELECT country, year, value, yoy_delta, ma_5y, is_below_replacement
-        FROM {gold_schema}.mart_tfr_metrics
-        {where_sql}
-        ORDER BY year ASC
-        LIMIT ?;
-        """
+        params = [p for p in (start, end) if p is not None]
         params.append(limit)
 
-        rows = _df_records(con, sql, params)
-        con.close()
-        return rows
+        con = _connect()
+        try:
+            sql = _tfr_range_sql(_gold_schema(), start is not None, end is not None)
+            reader = con.execute(sql, params).fetch_record_batch(STREAM_BATCH_ROWS)
+        except Exception:
+            con.close()
+            raise
+        return StreamingResponse(
+            _stream_json_array(reader, con), media_type="application/json"
+        )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -155,27 +309,44 @@ def tfr_range(
 
 
 @app.get("/runs")
+@cache(expire=CACHE_EXPIRE_SECONDS)
 def pipeline_runs(
     limit: int = Query(default=20, ge=1, le=500)
 ) -> List[Dict[str, Any]]:
     """Return recent pipeline runs from the ops schema."""
-    db_path = os.getenv("KFDP_DB_PATH", DB_PATH_DEFAULT)
     try:
-        con = _connect_readonly(db_path)
-        rows = _df_records(
-            con,
-            """
-            SELECT run_ts, status, source_file, silver_rows,
-                   silver_min_year, silver_max_year, gold_rows
-            FROM ops.pipeline_runs
-            ORDER BY run_ts DESC
-            LIMIT ?;
-            """,
-            [limit],
-        )
-        con.close()
-        return rows
+        with _connect() as con:
+            return _records(
+                con,
+                """
+                SELECT run_ts, status, source_file, silver_rows,
+                       silver_min_year, silver_max_year, gold_rows
+                FROM ops.pipeline_runs
+                ORDER BY run_ts DESC
+                LIMIT ?;
+                """,
+                [limit],
+            )
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/admin/invalidate")
+async def invalidate_cache(x_admin_token: Optional[str] = Header(default=None)) -> dict:
+    """
+    Clear cached responses and the detected gold schema.
+
+    Intended to be called after a pipeline run.  The endpoint is disabled
+    unless ``KFDP_ADMIN_TOKEN`` is set, and requests must send the same value
+    in the ``X-Admin-Token`` header.
+    """
+    expected = os.getenv("KFDP_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not secrets.compare_digest((x_admin_token or "").encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token.")
+    await FastAPICache.clear()
+    _detect_gold_schema_cached.cache_clear()
+    return {"status": "ok"}
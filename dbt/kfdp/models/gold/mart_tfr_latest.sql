@@ -0,0 +1,11 @@
+{{ config(materialized='table') }}
+
+SELECT
+  country,
+  year,
+  value,
+  yoy_delta,
+  ma_5y,
+  is_below_replacement
+FROM {{ ref('mart_tfr_metrics') }}
+QUALIFY ROW_NUMBER() OVER (PARTITION BY country ORDER BY year DESC) = 1
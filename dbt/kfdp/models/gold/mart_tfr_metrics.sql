@@ -1,3 +1,11 @@
+{{
+  config(
+    materialized='incremental',
+    unique_key=['country', 'year'],
+    incremental_strategy='delete+insert'
+  )
+}}
+
 WITH base AS (
   SELECT
     country,
@@ -20,4 +28,14 @@ metrics AS (
 )
 SELECT *
 FROM metrics
+{% if is_incremental() %}
+-- Window metrics are computed over the full history above; only new years and
+-- each country's most recent loaded year (which is usually provisional and
+-- may be revised) are written back.
+WHERE year >= (
+  SELECT COALESCE(MAX(t.year), 0)
+  FROM {{ this }} t
+  WHERE t.country = metrics.country
+)
+{% endif %}
 ORDER BY year
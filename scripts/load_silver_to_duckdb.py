@@ -3,10 +3,14 @@ from __future__ import annotations
 """
 Utility script for loading a silver parquet file into DuckDB.
 
-The silver parquet is loaded into the ``silver`` schema of the local DuckDB
-warehouse.  The script drops any existing ``silver.tfr_long`` table and
-recreates it from the input parquet file.  Basic statistics are printed
-after the load completes.
+The silver parquet (a single file, or a hive‑partitioned directory written
+with ``ingest_tfr.py --partition-by-year``) is loaded into the ``silver``
+schema of the local DuckDB warehouse.  The script replaces any existing
+``silver.tfr_long`` table with the contents of the input, sorted by country
+and year.  The path and modification time of the last loaded input are
+recorded in ``ops.ingest_marker`` so that re‑running against the same,
+unchanged parquet skips the reload.  Basic statistics are printed after the
+load completes.
 """
 
 import argparse
@@ -15,47 +19,99 @@ from pathlib import Path
 import duckdb
 from rich import print
 
+from kfdp.io.duckdb_config import duckdb_config
 
-def main() -> None:
-    """Parse arguments and load the parquet file into DuckDB."""
-    parser = argparse.ArgumentParser(
-        description="Load a silver parquet file into DuckDB (silver schema)."
-    )
-    parser.add_argument(
-        "--db",
-        type=str,
-        default="warehouse/kfdp.duckdb",
-        help="Path to the DuckDB file",
-    )
-    parser.add_argument(
-        "--parquet",
-        type=str,
-        default="data/silver/tfr_long.parquet",
-        help="Path to the input parquet file",
-    )
-    args = parser.parse_args()
 
-    db_path = Path(args.db)
-    parquet_path = Path(args.parquet)
+def load_silver(db_path: Path, parquet_path: Path, force: bool = False) -> None:
+    """
+    Load a silver parquet file (or partitioned directory) into ``silver.tfr_long``.
 
+    The load is skipped if the same input was already loaded unchanged, unless
+    ``force`` is set.
+    """
     if not parquet_path.exists():
         raise FileNotFoundError(
             f"Parquet file not found at {parquet_path}. Run the ingestion step first."
         )
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
-    con = duckdb.connect(str(db_path))
+    con = duckdb.connect(str(db_path), config=duckdb_config())
+    # Only the explicitly ordered INSERT needs ordering; let the rest of the
+    # bulk load skip insertion‑order bookkeeping.
+    con.execute("PRAGMA preserve_insertion_order=false;")
 
     # Ensure schemas exist
     con.execute("CREATE SCHEMA IF NOT EXISTS silver;")
     con.execute("CREATE SCHEMA IF NOT EXISTS gold;")
+    con.execute("CREATE SCHEMA IF NOT EXISTS ops;")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ops.ingest_marker (
+          parquet_path VARCHAR,
+          mtime DOUBLE
+        );
+        """
+    )
+
+    # A directory is read as a hive‑partitioned dataset (year=YYYY/*.parquet)
+    hive = parquet_path.is_dir()
+    if hive:
+        files = list(parquet_path.rglob("*.parquet"))
+        if not files:
+            raise FileNotFoundError(f"No parquet files found under {parquet_path}.")
+        source = str(parquet_path / "**" / "*.parquet")
+        pq_mtime = max(f.stat().st_mtime for f in files)
+    else:
+        source = str(parquet_path)
+        pq_mtime = parquet_path.stat().st_mtime
+
+    # Skip the reload if this exact parquet input is the last one loaded and
+    # has not changed since.  The marker table holds a single row.
+    marker = con.execute(
+        "SELECT parquet_path, mtime FROM ops.ingest_marker;"
+    ).fetchall()
+    silver_exists = con.execute(
+        """
+        SELECT COUNT(*)
+        FROM information_schema.tables
+        WHERE table_schema = 'silver' AND table_name = 'tfr_long';
+        """
+    ).fetchone()[0]
+    if not force and silver_exists and marker == [(str(parquet_path), pq_mtime)]:
+        print(f"[yellow]SKIP[/yellow] {parquet_path} unchanged since last load")
+        con.close()
+        return
 
-    # Recreate the silver table from the parquet file
-    con.execute("DROP TABLE IF EXISTS silver.tfr_long;")
+    # Replace the silver table from the parquet file and record the marker.
+    # The table is declared with explicit types and loaded sorted by
+    # (country, year) so DuckDB's per‑row‑group min/max statistics can prune
+    # the year range filters used downstream.
+    con.begin()
     con.execute(
-        "CREATE TABLE silver.tfr_long AS SELECT * FROM read_parquet(?);",
-        [str(parquet_path)],
+        """
+        CREATE OR REPLACE TABLE silver.tfr_long (
+          country VARCHAR,
+          indicator VARCHAR,
+          year INTEGER,
+          value DOUBLE,
+          source_file VARCHAR
+        );
+        """
     )
+    con.execute(
+        f"""
+        INSERT INTO silver.tfr_long
+        SELECT country, indicator, year, value, source_file
+        FROM read_parquet(?, hive_partitioning = {str(hive).lower()})
+        ORDER BY country, year;
+        """,
+        [source],
+    )
+    con.execute("DELETE FROM ops.ingest_marker;")
+    con.execute(
+        "INSERT INTO ops.ingest_marker VALUES (?, ?);", [str(parquet_path), pq_mtime]
+    )
+    con.commit()
 
     # Log some basic stats
     row_count = con.execute("SELECT COUNT(*) FROM silver.tfr_long;").fetchone()[0]
@@ -69,5 +125,32 @@ def main() -> None:
     con.close()
 
 
+def main() -> None:
+    """Parse arguments and load the parquet file into DuckDB."""
+    parser = argparse.ArgumentParser(
+        description="Load a silver parquet file into DuckDB (silver schema)."
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default="warehouse/kfdp.duckdb",
+        help="Path to the DuckDB file",
+    )
+    parser.add_argument(
+        "--parquet",
+        type=str,
+        default="data/silver/tfr_long.parquet",
+        help="Path to the input parquet file, or a hive‑partitioned parquet directory",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reload the parquet file even if it has not changed since the last load",
+    )
+    args = parser.parse_args()
+
+    load_silver(Path(args.db), Path(args.parquet), force=args.force)
+
+
 if __name__ == "__main__":
     main()
@@ -16,38 +16,20 @@ from pathlib import Path
 
 import duckdb
 
+from kfdp.io.duckdb_config import duckdb_config
 
-def main() -> None:
-    """Parse arguments and log a pipeline run into DuckDB."""
-    parser = argparse.ArgumentParser(
-        description="Log pipeline run metadata to DuckDB."
-    )
-    parser.add_argument(
-        "--db",
-        default="warehouse/kfdp.duckdb",
-        help="Path to the DuckDB database file",
-    )
-    parser.add_argument(
-        "--status",
-        required=True,
-        choices=["success", "failed"],
-        help="Execution status of the pipeline run",
-    )
-    parser.add_argument(
-        "--source-file",
-        dest="source_file",
-        default="tfr_source.xlsx",
-        help="Name of the input source file",
-    )
-    args = parser.parse_args()
 
-    db_path = Path(args.db)
-    con = duckdb.connect(str(db_path))
+def log_pipeline_run(db_path: Path, status: str, source_file: str) -> None:
+    """Insert one record describing a pipeline run into ``ops.pipeline_runs``."""
+    # ops.pipeline_runs stores naive UTC timestamps
+    run_ts = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    con = duckdb.connect(str(db_path), config=duckdb_config())
 
     # Ensure the ops schema and table exist
-    con.execute("CREATE SCHEMA IF NOT EXISTS ops;")
     con.execute(
         """
+        CREATE SCHEMA IF NOT EXISTS ops;
         CREATE TABLE IF NOT EXISTS ops.pipeline_runs (
           run_ts TIMESTAMP,
           status VARCHAR,
@@ -60,39 +42,66 @@ def main() -> None:
         """
     )
 
-    # Compute silver table statistics
-    silver_rows, min_year, max_year = con.execute(
-        "SELECT COUNT(*), MIN(year), MAX(year) FROM silver.tfr_long;"
+    # Compute gold table row count.  Some dbt‑duckdb versions create a 'main_gold'
+    # schema instead of 'gold', so look up which one holds the mart (preferring
+    # 'main_gold') in the catalog instead of probing each with a failing query.
+    schema = con.execute(
+        """
+        SELECT table_schema
+        FROM information_schema.tables
+        WHERE table_name = 'mart_tfr_metrics'
+          AND table_schema IN ('main_gold', 'gold')
+        ORDER BY table_schema = 'main_gold' DESC
+        LIMIT 1;
+        """
     ).fetchone()
+    gold_rows = (
+        con.execute(f"SELECT COUNT(*) FROM {schema[0]}.mart_tfr_metrics;").fetchone()[0]
+        if schema
+        else 0
+    )
 
-    # Compute gold table row count.  Some dbt‑duckdb versions create a 'main_gold'
-    # schema instead of 'gold', so we try both and use whichever exists.
-    gold_rows = 0
-    for schema in ("main_gold", "gold"):
-        try:
-            result = con.execute(
-                f"SELECT COUNT(*) FROM {schema}.mart_tfr_metrics;"
-            ).fetchone()
-            gold_rows = result[0]
-            break
-        except Exception:
-            continue
-
-    # Insert a new run record
+    # Insert a new run record, computing the silver statistics in the same statement
     con.execute(
-        "INSERT INTO ops.pipeline_runs VALUES (?, ?, ?, ?, ?, ?, ?);",
+        """
+        INSERT INTO ops.pipeline_runs
+        SELECT ?, ?, ?, COUNT(*), MIN(year), MAX(year), ?
+        FROM silver.tfr_long;
+        """,
         [
-            datetime.now(timezone.utc).replace(tzinfo=None),
-            args.status,
-            args.source_file,
-            silver_rows,
-            min_year,
-            max_year,
+            run_ts,
+            status,
+            source_file,
             gold_rows,
         ],
     )
     con.close()
 
 
+def main() -> None:
+    """Parse arguments and log a pipeline run into DuckDB."""
+    parser = argparse.ArgumentParser(description="Log pipeline run metadata to DuckDB.")
+    parser.add_argument(
+        "--db",
+        default="warehouse/kfdp.duckdb",
+        help="Path to the DuckDB database file",
+    )
+    parser.add_argument(
+        "--status",
+        required=True,
+        choices=["success", "failed"],
+        help="Execution status of the pipeline run",
+    )
+    parser.add_argument(
+        "--source-file",
+        dest="source_file",
+        default="tfr_source.xlsx",
+        help="Name of the input source file",
+    )
+    args = parser.parse_args()
+
+    log_pipeline_run(Path(args.db), args.status, args.source_file)
+
+
 if __name__ == "__main__":
     main()
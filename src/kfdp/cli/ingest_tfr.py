@@ -5,17 +5,49 @@ Command‑line interface for ingesting a Total Fertility Rate Excel file.
 
 This script reads an Excel workbook containing fertility rates, extracts a
 normalized time series using the functions in :mod:`kfdp.io.excel_tfr`,
-validates the resulting DataFrame, and writes it out as a parquet file.
+validates the resulting DataFrame, and writes it out as a zstd‑compressed
+parquet file using DuckDB.  For large series the output can instead be written
+as a hive‑partitioned dataset (one ``year=YYYY`` directory per year) so that
+readers filtering on year only touch the relevant files.
 """
 
 import argparse
 from pathlib import Path
 
+import duckdb
 from rich import print
 
 from kfdp.io.excel_tfr import extract_tfr_long_from_excel
 from kfdp.quality.checks import validate_tfr_long
 
+# Rows per parquet row group; a multiple of DuckDB's vector size that lets
+# downstream scans split the file across threads
+PARQUET_ROW_GROUP_SIZE = 122880
+
+
+def ingest_tfr(
+    input_path: Path, output_path: Path, partition_by_year: bool = False
+) -> None:
+    """Ingest the Excel file at ``input_path`` and write the silver parquet output."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    df = extract_tfr_long_from_excel(input_path)
+    validate_tfr_long(df)
+
+    # Write the parquet file with DuckDB, which is faster than pandas' writer
+    # and lets us control compression, row group sizing and partitioning
+    con = duckdb.connect()
+    con.register("tfr_long", df)
+    target = str(output_path).replace("'", "''")
+    partitioning = ", PARTITION_BY (year), OVERWRITE true" if partition_by_year else ""
+    con.execute(
+        f"COPY tfr_long TO '{target}' "
+        "(FORMAT 'parquet', COMPRESSION 'zstd', "
+        f"ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE}{partitioning});"
+    )
+    con.close()
+    print(f"[green]OK[/green] Wrote {len(df)} rows -> {output_path}")
+
 
 def main() -> None:
     """Parse arguments, ingest the Excel file and write a parquet file."""
@@ -34,19 +66,21 @@ def main() -> None:
         "--output",
         type=str,
         required=True,
-        help="Path to write the output parquet file",
+        help=(
+            "Path to write the output parquet file "
+            "(a directory with --partition-by-year)"
+        ),
+    )
+    parser.add_argument(
+        "--partition-by-year",
+        action="store_true",
+        help="Write a hive‑partitioned parquet dataset (year=YYYY/ directories)",
     )
     args = parser.parse_args()
 
-    input_path = Path(args.input)
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    df = extract_tfr_long_from_excel(input_path)
-    validate_tfr_long(df)
-
-    df.to_parquet(output_path, index=False)
-    print(f"[green]OK[/green] Wrote {len(df)} rows -> {output_path}")
+    ingest_tfr(
+        Path(args.input), Path(args.output), partition_by_year=args.partition_by_year
+    )
 
 
 if __name__ == "__main__":
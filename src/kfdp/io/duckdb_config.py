@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+"""
+DuckDB connection settings shared by the API and the pipeline scripts.
+
+DuckDB already sizes its thread pool and memory limit from the resources
+available to the process (including container limits), so these settings are
+only overridden when set explicitly through the environment:
+
+* ``KFDP_DUCKDB_THREADS`` – number of worker threads (e.g. ``4``)
+* ``KFDP_DUCKDB_MEMORY_LIMIT`` – memory cap (e.g. ``4GB``)
+"""
+
+import os
+from typing import Dict
+
+# DuckDB setting name -> environment variable overriding it
+_ENV_SETTINGS = {
+    "threads": "KFDP_DUCKDB_THREADS",
+    "memory_limit": "KFDP_DUCKDB_MEMORY_LIMIT",
+}
+
+
+def duckdb_config() -> Dict[str, str]:
+    """Return the ``config`` mapping for ``duckdb.connect`` from the environment."""
+    config = {}
+    for setting, env_var in _ENV_SETTINGS.items():
+        value = os.environ.get(env_var, "").strip()
+        if value:
+            config[setting] = value
+    return config
@@ -9,14 +9,29 @@ value rows heuristically and returns a tidy DataFrame suitable for
 downstream processing.
 """
 
+import logging
+import math
+import re
 from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Union, Tuple, List
 
+import numpy as np
 import pandas as pd
+from openpyxl import load_workbook
 
+logger = logging.getLogger(__name__)
 
-@dataclass(frozen=True)
+# Digits with an optional all‑zero fraction, e.g. "1970" or " 1970.0 "
+_YEAR_RE = re.compile(r"^\s*(\d+)(?:\.0+)?\s*$")
+
+# Number of leading rows searched for the year header before the full sheet
+_HEAD_SCAN_ROWS = 30
+
+
+@dataclass(frozen=True, slots=True)
 class TFRExtractConfig:
     """
     Configuration for extracting a Total Fertility Rate time series from an Excel file.
@@ -31,113 +46,224 @@ class TFRExtractConfig:
         Upper bound for plausible year values.
     min_year_cells: int
         Minimum number of year‑like cells required to detect the header row.
+    engine: str
+        Excel reader to use: ``"calamine"`` (the default; falls back to
+        openpyxl if ``python-calamine`` is not installed) or ``"openpyxl"``.
+    known_layout: Optional[Tuple[int, int, int, int]]
+        Zero‑based ``(year_row, value_row, first_col, last_col)`` of a sheet
+        whose layout is known.  When set, header detection is skipped and the
+        years and values are read from columns ``first_col..last_col``.  The
+        layout found by detection is logged so it can be pinned here.
     """
 
     sheet_name: Optional[Union[str, int]] = None
     min_year: int = 1900
     max_year: int = 2100
     min_year_cells: int = 3
+    engine: str = "calamine"
+    known_layout: Optional[Tuple[int, int, int, int]] = None
+
+
+_DEFAULT_CONFIG = TFRExtractConfig()
 
 
 def _to_int_if_yearish(x: object) -> Optional[int]:
     """Attempt to coerce ``x`` into an integer year (e.g. 1970, 1970.0, '1970.0')."""
-    if x is None or (isinstance(x, float) and pd.isna(x)):
+    # NaN never compares equal to itself, so keep it out of the parse cache
+    if (
+        x is None
+        or x is pd.NaT
+        or (isinstance(x, (float, np.floating)) and math.isnan(x))
+    ):
         return None
-    if isinstance(x, pd.Timestamp):
+    return _parse_year(x)
+
+
+@lru_cache(maxsize=4096)
+def _parse_year(x: object) -> Optional[int]:
+    """Cached worker for ``_to_int_if_yearish`` (header cells repeat across files)."""
+    if isinstance(x, date):
         return int(x.year)
-    if isinstance(x, int):
-        return x
-    if isinstance(x, float):
-        return int(x) if x.is_integer() else None
-    if isinstance(x, str):
-        s = x.strip().replace(",", "")
-        if s.endswith(".0"):
-            s = s[:-2]
-        return int(s) if s.isdigit() else None
-    # Fallback: try string conversion
-    try:
-        s = str(x).strip()
-        if s.endswith(".0"):
-            s = s[:-2]
-        return int(s) if s.isdigit() else None
-    except Exception:
-        return None
+    if isinstance(x, (int, np.integer)):
+        return int(x)
+    if isinstance(x, (float, np.floating)):
+        return int(x) if float(x).is_integer() else None
+    # Strings and anything else: match the textual form
+    m = _YEAR_RE.match(str(x).replace(",", ""))
+    return int(m.group(1)) if m else None
+
+
+def _to_float_array(cells: Union[pd.Series, np.ndarray]) -> np.ndarray:
+    """Coerce cells to a float array (``NaN`` if not numeric), ignoring commas."""
+    parsed = pd.to_numeric(
+        pd.Series(cells).astype(str).str.replace(",", "", regex=False), errors="coerce"
+    )
+    return parsed.to_numpy(dtype=float, na_value=np.nan, copy=True)
 
 
-def _is_year(x: object, min_year: int, max_year: int) -> bool:
-    """Return ``True`` if ``x`` is a year within the configured range."""
-    y = _to_int_if_yearish(x)
-    return y is not None and (min_year <= y <= max_year)
+def _read_rows_calamine(
+    excel_path: Path, sheet_name: Optional[Union[str, int]]
+) -> List[List[object]]:
+    """Read one sheet's cell values with ``python-calamine`` (blank as ``None``)."""
+    from python_calamine import CalamineWorkbook
 
+    wb = CalamineWorkbook.from_path(str(excel_path))
+    try:
+        if not wb.sheet_names:
+            raise ValueError("Failed to read sheets from Excel.")
+        if sheet_name is None:
+            ws = wb.get_sheet_by_index(0)
+        elif isinstance(sheet_name, int):
+            ws = wb.get_sheet_by_index(sheet_name)
+        else:
+            ws = wb.get_sheet_by_name(sheet_name)
+        # Keep leading empty rows/columns so cell positions match openpyxl
+        rows = ws.to_python(skip_empty_area=False)
+    finally:
+        wb.close()
+    return [[None if v == "" else v for v in row] for row in rows]
+
+
+def _read_rows_openpyxl(
+    excel_path: Path, sheet_name: Optional[Union[str, int]]
+) -> List[List[object]]:
+    """Read the cell values of one sheet with openpyxl in read‑only (streaming) mode."""
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        if not wb.sheetnames:
+            raise ValueError("Failed to read sheets from Excel.")
+        if sheet_name is None:
+            ws = wb.worksheets[0]
+        elif isinstance(sheet_name, int):
+            ws = wb.worksheets[sheet_name]
+        else:
+            ws = wb[sheet_name]
+        # Recorded dimensions can be stale; let openpyxl scan the actual cells
+        ws.reset_dimensions()
+        return [list(row) for row in ws.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def _read_sheet_cells(
+    excel_path: Path,
+    sheet_name: Optional[Union[str, int]] = None,
+    engine: str = "calamine",
+) -> np.ndarray:
+    """
+    Read one sheet of an Excel workbook into a 2‑D object array of cell values.
 
-def _as_float(x: object) -> Optional[float]:
-    """Convert ``x`` to a float if possible, otherwise return ``None``."""
-    if x is None or (isinstance(x, float) and pd.isna(x)):
-        return None
-    if isinstance(x, (int, float)) and not pd.isna(x):
-        return float(x)
-    if isinstance(x, str):
-        s = x.strip().replace(",", "")
-        if s == "":
-            return None
+    Only the requested sheet is parsed.  ``sheet_name`` may be a sheet name,
+    a zero‑based index, or ``None`` for the first sheet.  ``engine`` is
+    ``"calamine"`` (falls back to openpyxl if ``python-calamine`` is not
+    installed) or ``"openpyxl"``.
+    """
+    if engine not in ("calamine", "openpyxl"):
+        raise ValueError(f"Unsupported Excel engine: {engine!r}")
+
+    rows = None
+    if engine == "calamine":
         try:
-            return float(s)
-        except Exception:
-            return None
-    try:
-        return float(x)
-    except Exception:
-        return None
+            rows = _read_rows_calamine(excel_path, sheet_name)
+        except ImportError:
+            pass
+    if rows is None:
+        rows = _read_rows_openpyxl(excel_path, sheet_name)
+
+    # Drop trailing rows that carry no values (formatting only)
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+
+    # Rows can differ in length; pad them with None into a rectangular array
+    width = max((len(row) for row in rows), default=0)
+    cells = np.full((len(rows), width), None, dtype=object)
+    for i, row in enumerate(rows):
+        cells[i, : len(row)] = row
+    return cells
+
+
+def _score_header_rows(
+    cells: np.ndarray, min_year: int, max_year: int, min_year_cells: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score every row of ``cells`` (except the last) as a candidate year header.
 
+    Returns the per‑row year column mask, the score (``-1`` for rows with
+    fewer than ``min_year_cells`` years) and whether the row is a clean
+    header: at least twice ``min_year_cells`` years, each with a numeric
+    value directly below.
+    """
+    floats = _to_float_array(cells.ravel()).reshape(cells.shape)
+    numeric = ~np.isnan(floats)
 
-def _read_first_sheet_as_df(excel_path: Path) -> pd.DataFrame:
-    """Read the first sheet of an Excel workbook into a DataFrame with no header."""
-    all_sheets = pd.read_excel(excel_path, sheet_name=None, header=None, engine="openpyxl")
-    if not isinstance(all_sheets, dict) or len(all_sheets) == 0:
-        raise ValueError("Failed to read sheets from Excel.")
-    first_key = next(iter(all_sheets.keys()))
-    return all_sheets[first_key]
+    with np.errstate(invalid="ignore"):
+        years = np.where(
+            np.isfinite(floats) & (floats == np.floor(floats)), floats, np.nan
+        )
+
+    # Cells that are neither empty nor numeric (labels, dates) go through the
+    # scalar year parser
+    for r, c in np.argwhere(~numeric & pd.notna(cells)):
+        y = _to_int_if_yearish(cells[r, c])
+        if y is not None:
+            years[r, c] = y
+
+    with np.errstate(invalid="ignore"):
+        year_mask = (years >= min_year) & (years <= max_year)
+
+    # The last row cannot be a header since there is no value row below it
+    year_mask = year_mask[:-1]
+    year_counts = year_mask.sum(axis=1)
+    numeric_below = (year_mask & numeric[1:]).sum(axis=1)
+
+    candidate = year_counts >= min_year_cells
+    score = np.where(candidate, year_counts * 10 + numeric_below, -1)
+    clean = (
+        candidate & (year_counts >= 2 * min_year_cells) & (numeric_below == year_counts)
+    )
+    return year_mask, score, clean
 
 
 def _detect_year_and_value_rows(
-    raw: pd.DataFrame, min_year: int, max_year: int, min_year_cells: int
+    cells: np.ndarray, min_year: int, max_year: int, min_year_cells: int
 ) -> Tuple[int, int, List[int]]:
     """
     Detect the header row containing years and the subsequent row containing values.
 
-    The function scans each row looking for a set of columns that contain many
-    year‑like values (according to ``_is_year``).  It then checks that the next
-    row has numeric values in those same columns.  A simple scoring heuristic
-    prefers rows with more matched years and more numeric values below.
-    """
-    best: Optional[Tuple[int, int, int, List[int]]] = None  # (score, year_row_idx, value_row_idx, columns)
-
-    for row_idx in range(len(raw) - 1):
-        row = raw.iloc[row_idx]
-        year_cols = [col for col in raw.columns if _is_year(row[col], min_year, max_year)]
-        if len(year_cols) < min_year_cells:
-            continue
-
-        next_row = raw.iloc[row_idx + 1]
-        numeric_count = sum(1 for c in year_cols if _as_float(next_row[c]) is not None)
+    Every cell is coerced to a number in a single pass over the flattened
+    sheet.  A row is a year header candidate if enough of its cells are whole
+    numbers within ``[min_year, max_year]``; the next row must then have
+    numeric values in those same columns.  A simple scoring heuristic prefers
+    rows with more matched years and more numeric values below.  Columns are
+    returned as positions.
 
-        score = len(year_cols) * 10 + numeric_count
-        if best is None or score > best[0]:
-            best = (score, row_idx, row_idx + 1, year_cols)
+    Year headers normally sit near the top of the sheet, so the first
+    ``_HEAD_SCAN_ROWS`` rows are scanned on their own first; the rest of the
+    sheet is only scanned if that window holds no clean header.
+    """
+    head = cells[: _HEAD_SCAN_ROWS + 1]
+    year_mask, score, clean = _score_header_rows(
+        head, min_year, max_year, min_year_cells
+    )
+    if not clean.any() and len(cells) > len(head):
+        year_mask, score, clean = _score_header_rows(
+            cells, min_year, max_year, min_year_cells
+        )
 
-    if best is None:
+    if score.size == 0 or score.max() < 0:
         raise ValueError(
             "Could not detect a row with year headers.  "
             "Check that the file contains a row of years followed by numeric values."
         )
 
-    _, year_row_idx, value_row_idx, cols = best
-    return year_row_idx, value_row_idx, cols
+    year_row_idx = int(np.argmax(score))
+    cols = np.flatnonzero(year_mask[year_row_idx]).tolist()
+    return year_row_idx, year_row_idx + 1, cols
 
 
 def extract_tfr_long_from_excel(
     excel_path: Path,
-    config: TFRExtractConfig = TFRExtractConfig(),
+    config: Optional[TFRExtractConfig] = None,
 ) -> pd.DataFrame:
     """
     Extract a long‑format DataFrame of total fertility rate values from an Excel workbook.
@@ -145,36 +271,88 @@ def extract_tfr_long_from_excel(
     The resulting DataFrame has columns: ``country``, ``indicator``, ``year``, ``value``
     and ``source_file``.  Any rows with missing values are dropped and the result
     is sorted by year.
+
+    Results are cached per file version (path, modification time and size) and
+    config, so re‑reading an unchanged workbook does not parse it again.  Each
+    call returns its own copy of the cached frame.  ``config`` defaults to
+    ``TFRExtractConfig()``.
     """
+    if config is None:
+        config = _DEFAULT_CONFIG
     if not excel_path.exists():
         raise FileNotFoundError(f"Excel file not found: {excel_path}")
 
-    if config.sheet_name is None:
-        raw = _read_first_sheet_as_df(excel_path)
+    stat = excel_path.stat()
+    df = _extract_cached(str(excel_path), stat.st_mtime_ns, stat.st_size, config)
+    return df.copy()
+
+
+@lru_cache(maxsize=32)
+def _extract_cached(
+    path: str, mtime_ns: int, size: int, config: TFRExtractConfig
+) -> pd.DataFrame:
+    """Parse the workbook at ``path``; the file's mtime and size only key the cache."""
+    excel_path = Path(path)
+    cells = _read_sheet_cells(excel_path, config.sheet_name, config.engine)
+
+    if config.known_layout is not None:
+        year_row_idx, value_row_idx, first_col, last_col = config.known_layout
+        n_rows, n_cols = cells.shape
+        if not (
+            0 <= year_row_idx < n_rows
+            and 0 <= value_row_idx < n_rows
+            and 0 <= first_col <= last_col < n_cols
+        ):
+            raise ValueError(
+                f"known_layout {config.known_layout} is outside the sheet "
+                f"({n_rows} rows x {n_cols} columns)."
+            )
+        year_cols = list(range(first_col, last_col + 1))
     else:
-        raw = pd.read_excel(
-            excel_path, sheet_name=config.sheet_name, header=None, engine="openpyxl"
+        year_row_idx, value_row_idx, year_cols = _detect_year_and_value_rows(
+            cells, config.min_year, config.max_year, config.min_year_cells
+        )
+        logger.info(
+            "Detected TFR layout in %s: known_layout=(%d, %d, %d, %d)",
+            excel_path.name,
+            year_row_idx,
+            value_row_idx,
+            year_cols[0],
+            year_cols[-1],
         )
 
-    year_row_idx, value_row_idx, year_cols = _detect_year_and_value_rows(
-        raw, config.min_year, config.max_year, config.min_year_cells
+    year_cells = cells[year_row_idx, year_cols]
+
+    # Coerce the year and value rows in one pass each; only year cells that
+    # are not plain numbers (e.g. dates) go through the scalar parser
+    years = _to_float_array(year_cells)
+    for i in np.flatnonzero(np.isnan(years)):
+        y = _to_int_if_yearish(year_cells[i])
+        if y is not None:
+            years[i] = y
+    values = _to_float_array(cells[value_row_idx, year_cols])
+
+    # Keep only whole-number years in range that have a value (a pinned layout
+    # may span gap or note columns), then order by year on the arrays, so the
+    # frame is built once, already filtered and sorted
+    keep = (
+        (years == np.floor(years))
+        & (years >= config.min_year)
+        & (years <= config.max_year)
+        & ~np.isnan(values)
     )
+    if config.known_layout is not None and not keep.any():
+        raise ValueError(
+            f"known_layout {config.known_layout} has no year/value pairs "
+            f"in [{config.min_year}, {config.max_year}]."
+        )
+    years = years[keep].astype(np.int64)
+    values = values[keep]
+    order = np.argsort(years, kind="stable")
+    years = years[order]
+    values = values[order]
 
-    year_row = raw.iloc[year_row_idx]
-    value_row = raw.iloc[value_row_idx]
-
-    years: List[int] = []
-    values: List[float] = []
-    for col in year_cols:
-        y = _to_int_if_yearish(year_row[col])
-        v = _as_float(value_row[col])
-        if y is None:
-            continue
-        years.append(int(y))
-        # Represent missing numeric values as NaN so that pandas can handle them
-        values.append(float("nan") if v is None else float(v))
-
-    df = pd.DataFrame(
+    return pd.DataFrame(
         {
             "country": "KOR",
             "indicator": "TFR",
@@ -183,6 +361,3 @@ def extract_tfr_long_from_excel(
             "source_file": excel_path.name,
         }
     )
-
-    df = df.dropna(subset=["value"]).sort_values("year").reset_index(drop=True)
-    return df
@@ -8,9 +8,25 @@ ensuring that required columns are present, values are non‑negative and
 unique per year, and that there are no missing years or values.
 """
 
+import numpy as np
 import pandas as pd
 
 
+def _year_value_clean(year: np.ndarray, value: np.ndarray) -> bool:
+    """
+    Return ``True`` if ``year`` has no NA and ``value`` no NA or negative values.
+
+    Only plain NumPy numeric arrays are checked here; anything else returns
+    ``False`` so the caller falls back to the individual checks.
+    """
+    if year.dtype.kind not in "iuf" or value.dtype.kind not in "iuf":
+        return False
+    # NaN >= 0 is False, so one comparison rules out both NA and negatives
+    if not (value >= 0).all():
+        return False
+    return year.dtype.kind != "f" or not np.isnan(year).any()
+
+
 def validate_tfr_long(df: pd.DataFrame) -> None:
     """
     Raise an exception if the TFR DataFrame does not meet basic quality expectations.
@@ -36,15 +52,33 @@ def validate_tfr_long(df: pd.DataFrame) -> None:
     if (df["indicator"] != "TFR").any():
         raise ValueError("Unexpected indicator values found (expected only 'TFR').")
 
-    if df["year"].isna().any():
-        raise ValueError("Year contains NA.")
+    # Pull the numeric columns out once and run the remaining checks on the
+    # NumPy arrays.  Clean frames pass a single fused check; the individual
+    # checks only run to report which constraint failed.
+    year = df["year"].to_numpy()
+    value = df["value"].to_numpy()
+
+    if not _year_value_clean(year, value):
+        if pd.isna(year).any():
+            raise ValueError("Year contains NA.")
 
-    if df["value"].isna().any():
-        raise ValueError("Value contains NA.")
+        if pd.isna(value).any():
+            raise ValueError("Value contains NA.")
 
-    if (df["value"] < 0).any():
-        raise ValueError("TFR cannot be negative.")
+        if np.any(value < 0):
+            raise ValueError("TFR cannot be negative.")
 
-    # Basic sanity: years should be unique for a single indicator/country file
-    if df.duplicated(subset=["country", "indicator", "year"]).any():
+    # Basic sanity: years should be unique for a single indicator/country file.
+    # The indicator is constant at this point, so for a single‑country frame a
+    # test on the year column is enough instead of hashing all three keys.
+    # Extracted frames are sorted by year, so a strictly increasing column
+    # proves uniqueness without sorting it first.
+    country = df["country"]
+    if (country == country.iat[0]).all():
+        duplicated = not (np.diff(year) > 0).all() and bool(
+            (np.diff(np.sort(year)) == 0).any()
+        )
+    else:
+        duplicated = df.duplicated(subset=["country", "indicator", "year"]).any()
+    if duplicated:
         raise ValueError("Duplicate (country, indicator, year) rows detected.")
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.app import app  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db = tmp_path / "kfdp.duckdb"
+    with duckdb.connect(str(db)) as con:
+        con.execute(
+            """
+            CREATE SCHEMA main_gold;
+            CREATE TABLE main_gold.mart_tfr_metrics AS
+            SELECT 'KOR' AS country, 2024 AS year, 0.72 AS value,
+                   -0.06 AS yoy_delta, 0.8 AS ma_5y, true AS is_below_replacement;
+            CREATE TABLE main_gold.mart_tfr_latest AS
+            SELECT * FROM main_gold.mart_tfr_metrics;
+            CREATE SCHEMA ops;
+            CREATE TABLE ops.pipeline_runs AS
+            SELECT TIMESTAMP '2025-01-01 03:00:00.123456' AS run_ts,
+                   'success' AS status, 'tfr_source.xlsx' AS source_file,
+                   55 AS silver_rows, 1970 AS silver_min_year,
+                   2024 AS silver_max_year, 55 AS gold_rows;
+            """
+        )
+    monkeypatch.setenv("KFDP_DB_PATH", str(db))
+    monkeypatch.delenv("KFDP_ADMIN_TOKEN", raising=False)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.mark.parametrize("path", ["/tfr/latest", "/runs"])
+def test_cache_hit_matches_miss(client, path) -> None:
+    """A cached response has the same body as the response that filled it."""
+    miss = client.get(path)
+    hit = client.get(path)
+    assert miss.headers["x-fastapi-cache"] == "MISS"
+    assert hit.headers["x-fastapi-cache"] == "HIT"
+    assert hit.content == miss.content
+    assert hit.headers["cache-control"] == "no-cache"
+
+
+def test_runs_timestamps_are_iso_strings(client) -> None:
+    assert client.get("/runs").json()[0]["run_ts"] == "2025-01-01T03:00:00.123456"
+
+
+def test_admin_invalidate_auth(client, monkeypatch) -> None:
+    """The endpoint is hidden without a token and rejects a wrong one."""
+    assert client.post("/admin/invalidate").status_code == 404
+
+    monkeypatch.setenv("KFDP_ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/invalidate").status_code == 403
+    wrong = {"X-Admin-Token": "wrong"}
+    assert client.post("/admin/invalidate", headers=wrong).status_code == 403
+
+    client.get("/runs")
+    ok = client.post("/admin/invalidate", headers={"X-Admin-Token": "s3cret"})
+    assert ok.status_code == 200
+    assert client.get("/runs").headers["x-fastapi-cache"] == "MISS"
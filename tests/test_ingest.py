@@ -1,8 +1,15 @@
 from pathlib import Path
 
 import pandas as pd
+import pytest
+from openpyxl import Workbook
 
-from kfdp.io.excel_tfr import extract_tfr_long_from_excel
+from kfdp.io.excel_tfr import (
+    TFRExtractConfig,
+    _detect_year_and_value_rows,
+    _read_sheet_cells,
+    extract_tfr_long_from_excel,
+)
 from kfdp.quality.checks import validate_tfr_long
 
 
@@ -17,3 +24,58 @@ def test_extract_and_validate() -> None:
         df.columns
     )
     assert df["year"].is_monotonic_increasing
+
+
+def test_known_layout_matches_detection() -> None:
+    """Pinning the detected layout gives the same result as detection."""
+    p = Path("data/bronze/tfr_source.xlsx")
+    config = TFRExtractConfig()
+    year_row, value_row, year_cols = _detect_year_and_value_rows(
+        _read_sheet_cells(p, config.sheet_name, config.engine),
+        config.min_year,
+        config.max_year,
+        config.min_year_cells,
+    )
+    layout = (year_row, value_row, year_cols[0], year_cols[-1])
+
+    detected = extract_tfr_long_from_excel(p)
+    pinned = extract_tfr_long_from_excel(p, TFRExtractConfig(known_layout=layout))
+    pd.testing.assert_frame_equal(detected, pinned)
+
+
+def test_known_layout_skips_non_year_columns(tmp_path) -> None:
+    """A pinned layout only keeps whole-number years in range."""
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["TFR", 2000, 2000.5, 7, "note", 2001])
+    ws.append([None, 1.5, 1.4, 1.3, 1.2, 1.1])
+    p = tmp_path / "gaps.xlsx"
+    wb.save(p)
+
+    df = extract_tfr_long_from_excel(p, TFRExtractConfig(known_layout=(0, 1, 1, 5)))
+    assert df["year"].tolist() == [2000, 2001]
+    assert df["value"].tolist() == [1.5, 1.1]
+
+    with pytest.raises(ValueError, match="no year/value pairs"):
+        extract_tfr_long_from_excel(p, TFRExtractConfig(known_layout=(0, 1, 2, 4)))
+
+
+def test_engines_agree_on_cell_positions(tmp_path) -> None:
+    """Leading empty rows/columns are kept, so layouts are engine independent."""
+    wb = Workbook()
+    ws = wb.active
+    ws["C3"] = "TFR"
+    for i, year in enumerate(range(2000, 2005)):
+        ws.cell(row=4, column=4 + i, value=year)
+        ws.cell(row=5, column=4 + i, value=1.0 + i / 10)
+    p = tmp_path / "offset.xlsx"
+    wb.save(p)
+
+    frames = [
+        extract_tfr_long_from_excel(
+            p, TFRExtractConfig(engine=engine, known_layout=(3, 4, 3, 7))
+        )
+        for engine in ("calamine", "openpyxl")
+    ]
+    assert len(frames[0]) == 5
+    pd.testing.assert_frame_equal(frames[0], frames[1])
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from load_silver_to_duckdb import load_silver  # noqa: E402
+
+
+def _write_parquet(path: Path, years: list) -> None:
+    df = pd.DataFrame(
+        {
+            "country": "KOR",
+            "indicator": "TFR",
+            "year": years,
+            "value": [1.0] * len(years),
+            "source_file": "tfr_source.xlsx",
+        }
+    )
+    df.to_parquet(path, index=False)
+
+
+def _silver_years(db: Path) -> tuple:
+    with duckdb.connect(str(db)) as con:
+        return con.execute(
+            "SELECT MIN(year), MAX(year) FROM silver.tfr_long;"
+        ).fetchone()
+
+
+def test_load_silver_skips_only_the_last_loaded_input(tmp_path, capsys) -> None:
+    """An unchanged input is skipped only if it is the one currently loaded."""
+    db = tmp_path / "kfdp.duckdb"
+    a = tmp_path / "a.parquet"
+    b = tmp_path / "b.parquet"
+    _write_parquet(a, [2000, 2001])
+    _write_parquet(b, [2010, 2011, 2012])
+
+    load_silver(db, a)
+    load_silver(db, a)
+    assert "SKIP" in capsys.readouterr().out
+    assert _silver_years(db) == (2000, 2001)
+
+    # Switching inputs and back must reload, not skip on a stale marker
+    load_silver(db, b)
+    assert _silver_years(db) == (2010, 2012)
+    load_silver(db, a)
+    assert "SKIP" not in capsys.readouterr().out
+    assert _silver_years(db) == (2000, 2001)
+
+    # --force reloads an unchanged input
+    load_silver(db, a, force=True)
+    assert "SKIP" not in capsys.readouterr().out